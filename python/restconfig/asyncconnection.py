@@ -0,0 +1,132 @@
+"""
+Async connection module provides an asyncio counterpart to RestApiConnection, for callers that want to overlap many
+config lookups against the same REST API.
+"""
+
+import asyncio
+from .connection import RestApiResponseError, _no_such_section
+from .util import response_ok, response_json, quote_path_segment
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class AsyncRestApiConnection:
+    """Asyncio version of RestApiConnection backed by a single pooled httpx client.
+
+    This does not subclass Connection because every lookup is a coroutine, so it can't stand in for a synchronous
+    backend behind ReadOnlyConfig or the blueprint. With http2 enabled, concurrent lookups are multiplexed over one
+    connection. Requires the httpx package, plus h2 for http2.
+    """
+
+    def __init__(self, base_url: str, username: str = None, password: str = None, headers: dict = None,
+                 http2: bool = True, max_connections: int = 100):
+        """
+
+        :param base_url: Root URL of API to connect to.
+        :param username: Use username if provided.
+        :param password: Use password if provided.
+        :param headers: Headers sent with every request.
+        :param http2: Negotiate HTTP/2 so concurrent requests share a connection.
+        :param max_connections: Upper bound on open connections to the API host.
+        """
+        if httpx is None:
+            raise ImportError("httpx is required for AsyncRestApiConnection.")
+        self.username = username
+        self.password = password
+        self.headers = headers
+        self.base_url = base_url.strip()
+
+        if self.username is None:
+            self.username = ""
+        if self.password is None:
+            self.password = ""
+
+        auth_tuple = None
+        if not ((self.username == "") and (self.password == "")):
+            auth_tuple = (self.username, self.password)
+
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url, http2=http2, auth=auth_tuple, headers=self.headers,
+            limits=httpx.Limits(max_keepalive_connections=max_connections, max_connections=max_connections))
+
+    async def aclose(self):
+        """Release the pooled connections held by this instance."""
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def get(self, sub_path: str, headers: dict = None, **kwargs):
+        """Make a get request relative to the API url specified."""
+        return await self._client.get(sub_path, headers=headers, **kwargs)
+
+    async def _get_data(self, sub_path: str, section: str = None):
+        """Return the 'data' member of the document at sub_path.
+
+        If section is given, a 404 saying there is no such section raises KeyError, as RestApiConnection does.
+        """
+        r = await self.get(sub_path)
+        if (section is not None) and (r.status_code == 404):
+            try:
+                body = response_json(r)
+            except Exception:
+                body = None
+            if _no_such_section(body):
+                raise KeyError(f"No such section {section}.")
+        if not response_ok(r, allowed_status=[200]):
+            raise RestApiResponseError(f"Received unexpected {r.status_code} response from API:\n{r.text}.")
+        try:
+            return response_json(r)['data']
+        except Exception as e:
+            raise RestApiResponseError("Problem with response received from API: " + str(e))
+
+    async def sections(self) -> list[str]:
+        return list((await self._get_data(""))['sections'])
+
+    async def default_section(self) -> str:
+        return (await self._get_data(""))['default_section']
+
+    async def has_section(self, name: str) -> bool:
+        json_data = await self._get_data("")
+        return (name in json_data['sections']) or (name == json_data['default_section'])
+
+    async def get_section(self, section: str) -> list:
+        return list((await self._get_data(f"/section/{quote_path_segment(section)}", section))['options'])
+
+    async def get_option(self, section: str, option: str) -> str:
+        r = await self.get(f"/section/{quote_path_segment(section)}/option/{quote_path_segment(option)}")
+
+        if not response_ok(r, allowed_status=[200, 404]):
+            raise RestApiResponseError(f"Received unexpected {r.status_code} response from API:\n{r.text}.")
+        try:
+            body = response_json(r)
+        except Exception as e:
+            raise RestApiResponseError("Problem with response received from API: " + str(e))
+
+        if r.status_code == 404:
+            message = body.get('message')
+            if message in ['no such section', 'no such option']:
+                raise KeyError(f"No such option {option} in section {section}.")
+            raise RestApiResponseError(f"Problem with response received from API: {message}")
+        return body['data']['option']
+
+    async def has_option(self, section: str, option: str) -> bool:
+        try:
+            await self.get_option(section, option)
+            return True
+        except KeyError:
+            return False
+
+    async def bulk_get_options(self, section: str, options: list) -> dict:
+        """Fetch several options from one section concurrently, returning {option: value}."""
+        values = await asyncio.gather(*(self.get_option(section, o) for o in options))
+        return dict(zip(options, values))
+
+    async def defaults(self) -> dict:
+        return dict(await self._get_data("/defaults"))
@@ -1,12 +1,64 @@
 import functools
+import gzip
+import hashlib
+import json
 from configparser import SectionProxy, RawConfigParser, NoOptionError, NoSectionError
 from flask import Blueprint, request, jsonify, make_response, Response, Request
 from .connection import Connection
 
+# Responses smaller than this aren't worth the cost of compressing.
+COMPRESS_MIN_SIZE = 1024
 
-def construct_restconfig_blueprint(_config: Connection) -> Blueprint:
+# Config documents can hold secrets, so by default only the requesting client may keep a copy, never a shared proxy.
+CACHE_CONTROL = 'private, max-age=5, must-revalidate'
+
+
+def _conditional_response(payload: dict) -> Response:
+    """Build a 200 response tagged with a content hash, answering with 304 if the client already holds it."""
+    etag = hashlib.blake2b(json.dumps(payload, sort_keys=True).encode(), digest_size=16).hexdigest()
+    response = make_response(jsonify(payload), 200)
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+def _section_options(config: Connection, section: str):
+    """Return {option: value} for a section, or just the option names if any value can't be read.
+
+    Clients already handle a plain name list, from servers that predate values in section documents, by asking for
+    each option separately, so one bad value (a broken interpolation, say) only fails the request for that option.
+    """
+    options = list(config.get_section(section))
+    try:
+        return {option: config.get_option(section, option) for option in options}
+    except Exception:
+        return options
+
+
+def construct_restconfig_blueprint(_config: Connection, cache_control: str = CACHE_CONTROL) -> Blueprint:
     restconfig = Blueprint("restconfig", __name__)
 
+    @restconfig.after_request
+    def compress_response(response: Response) -> Response:
+        if response.status_code not in [200, 304]:
+            return response
+        if cache_control:
+            response.headers['Cache-Control'] = cache_control
+        if (response.status_code != 200) or response.direct_passthrough or ('Content-Encoding' in response.headers):
+            return response
+        response.vary.add('Accept-Encoding')
+        if not request.accept_encodings['gzip']:
+            return response
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        response.set_data(gzip.compress(data, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+        # The compressed body is a different byte sequence, so its tag can only be a weak match for the original.
+        etag, weak = response.get_etag()
+        if etag is not None:
+            response.set_etag(etag, weak=True)
+        return response
+
     @restconfig.route("", methods=['GET'], strict_slashes=False)
     def send_root():
         message = 'ok'
@@ -14,7 +66,7 @@ def construct_restconfig_blueprint(_config: Connection) -> Blueprint:
         config = _config
         data['default_section'] = config.default_section()
         data['sections'] = config.sections()
-        return make_response(jsonify({'message': message, 'data': data}), 200)
+        return _conditional_response({'message': message, 'data': data})
 
     @restconfig.route("section/<section>", methods=['GET'], strict_slashes=False)
     def get_section(section: str):
@@ -24,16 +76,38 @@ def construct_restconfig_blueprint(_config: Connection) -> Blueprint:
             return make_response(jsonify({'message': 'no such section', 'data': {}}), 404)
 
         message = 'ok'
-        data = {'section': section, 'options': config.get_section(section)}
+        data = {'section': section, 'options': _section_options(config, section)}
+        payload = {'message': message, 'data': data}
+        return _conditional_response(payload)
+
+    @restconfig.route("section/<section>/keys", methods=['GET'], strict_slashes=False)
+    def get_section_keys(section: str):
+        config = _config
+        if not config.has_section(section):
+            return make_response(jsonify({'message': 'no such section', 'data': {}}), 404)
+
+        message = 'ok'
+        data = {'section': section, 'options': list(config.get_section(section))}
         payload = {'message': message, 'data': data}
-        return make_response(jsonify(payload), 200)
+        return _conditional_response(payload)
+
+    @restconfig.route("bulk", methods=['GET'], strict_slashes=False)
+    def get_bulk():
+        config = _config
+        message = 'ok'
+        data = {
+            'default_section': config.default_section(),
+            'sections': {section: _section_options(config, section) for section in config.sections()},
+            'defaults': dict(config.defaults()),
+        }
+        return _conditional_response({'message': message, 'data': data})
 
     @restconfig.route("defaults", methods=['GET'], strict_slashes=False)
     def get_defaults():
         config = _config
         data = dict(config.defaults())
         message = 'ok'
-        return make_response(jsonify({'message': message, 'data': data}))
+        return _conditional_response({'message': message, 'data': data})
 
     @restconfig.route("section/<section>/option/<option>", methods=['GET'], strict_slashes=False)
     def get_option(section: str, option: str):
@@ -45,6 +119,6 @@ def construct_restconfig_blueprint(_config: Connection) -> Blueprint:
         message = 'ok'
         data = {'section': section, 'option': config.get_option(section, option)}
         payload = {'message': message, 'data': data}
-        return make_response(jsonify(payload), 200)
+        return _conditional_response(payload)
 
     return restconfig
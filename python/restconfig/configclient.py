@@ -2,17 +2,47 @@
 ConfigParser client module provides drop-in replacements for regular configparser objects that are backed by a REST API.
 """
 
-from configparser import SectionProxy, RawConfigParser, ConverterMapping
+from collections.abc import Mapping
+from configparser import SectionProxy, ConverterMapping, NoOptionError, NoSectionError, RawConfigParser
 from typing import AbstractSet, Tuple, Union, Iterator, List
 from .connection import UNSET, Connection
 
 
-class ReadOnlyConfig(RawConfigParser):
+class ReadOnlyConfig(Mapping):
+    """Read-only mapping of section names to SectionProxy objects, with the RawConfigParser read API.
+
+    This deliberately isn't a RawConfigParser subclass: every lookup goes to the backend, so none of the parser's own
+    storage or interpolation setup is needed. It is registered as a virtual subclass instead, so code that checks
+    isinstance(x, RawConfigParser) still accepts it.
+    """
 
     def __init__(self, backend: Connection, default_section="DEFAULT"):
         self.backend = backend
-        self._converters = ConverterMapping(self)
         self.default_section = default_section
+        self._proxy_cache = {}
+        self._converters = ConverterMapping(self)
+
+    @property
+    def converters(self) -> ConverterMapping:
+        return self._converters
+
+    def _proxy(self, section: str) -> SectionProxy:
+        proxy = self._proxy_cache.get(section)
+        if proxy is None:
+            proxy = SectionProxy(self, section)
+            self._proxy_cache[section] = proxy
+        return proxy
+
+    def _lookup_error(self, section: str, option: str) -> Exception:
+        """Return the configparser error RawConfigParser would raise for a failed lookup of option in section."""
+        if not self.backend.has_section(section):
+            return NoSectionError(section)
+        return NoOptionError(option, section)
+
+    def invalidate(self):
+        """Drop cached data here and in the backend so the next lookup sees current values."""
+        self._proxy_cache = {}
+        self.backend.invalidate()
 
     def __len__(self) -> int:
         return self.backend.__len__()
@@ -23,7 +53,7 @@ class ReadOnlyConfig(RawConfigParser):
     def __getitem__(self, section: str) -> SectionProxy:
         if section not in self:
             raise KeyError(f"No section '{section}' in config.")
-        return SectionProxy(self, section)
+        return self._proxy(section)
 
     def __iter__(self) -> Iterator[str]:
         return self.backend.__iter__()
@@ -41,7 +71,7 @@ class ReadOnlyConfig(RawConfigParser):
         return self.backend.has_section(section)
 
     def options(self, section: str) -> List[str]:
-        return self.backend.get_section(section)
+        return list(self.backend.get_section(section))
 
     def has_option(self, section: str, option: str) -> bool:
         return self.backend.has_option(section, option)
@@ -51,6 +81,8 @@ class ReadOnlyConfig(RawConfigParser):
         try:
             opt = self.backend.get_option(section, option)
         except KeyError:
+            if fallback is UNSET:
+                raise self._lookup_error(section, option) from None
             return fallback
         return int(opt)
 
@@ -60,6 +92,8 @@ class ReadOnlyConfig(RawConfigParser):
         try:
             opt = self.backend.get_option(section, option)
         except KeyError:
+            if fallback is UNSET:
+                raise self._lookup_error(section, option) from None
             return fallback
         return float(opt)
 
@@ -69,6 +103,8 @@ class ReadOnlyConfig(RawConfigParser):
         try:
             opt = self.backend.get_option(section, option)
         except KeyError:
+            if fallback is UNSET:
+                raise self._lookup_error(section, option) from None
             return fallback
         return bool(opt)
 
@@ -81,7 +117,7 @@ class ReadOnlyConfig(RawConfigParser):
             return fallback
 
     def items(self, *, raw: bool = False, vars: dict = None) -> List[Tuple[str, SectionProxy]]:
-        s = []
-        for i in self.keys():
-            s.append((i, SectionProxy(self, i)))
-        return s
+        return [(i, self._proxy(i)) for i in self.sections()]
+
+
+RawConfigParser.register(ReadOnlyConfig)
@@ -1,13 +1,51 @@
-from .util import naive_url_path_join, response_ok
+from .util import naive_url_path_join, response_ok, response_json, quote_path_segment
+import functools
 import requests
-from configparser import SectionProxy, RawConfigParser
-from urllib.parse import quote_plus
+import threading
+import time
+import types
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from abc import ABC, abstractmethod
+from configparser import SectionProxy, RawConfigParser, NoOptionError, NoSectionError
+from typing import Iterable
+from urllib.parse import urlsplit
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 UNSET = object()
 
+# Upper bound on the number of response bodies RestApiConnection keeps for ETag revalidation.
+ETAG_CACHE_SIZE = 1024
+
+# Seconds RestApiConnection waits before asking for a /bulk document again after it couldn't be used.
+BULK_RETRY_INTERVAL = 60.0
+
+
+def _environ_proxy(url: str):
+    """Return the proxy the HTTP(S)_PROXY/NO_PROXY environment variables select for url, the way requests does."""
+    proxies = requests.utils.get_environ_proxies(url)
+    return proxies.get(urlsplit(url).scheme) or proxies.get('all')
+
+
+def _no_such_section(body) -> bool:
+    """Check whether a parsed 404 body is the API reporting a missing section, rather than a missing endpoint."""
+    return isinstance(body, dict) and (body.get('message') == 'no such section')
+
 
 class AbstractClassError(Exception):
-    """Raised when attempting to use an abstract class method that isn't implemented in the abstract."""
+    """Formerly raised by unimplemented Connection methods. Kept for callers that still import it; Connection now
+    declares its abstract methods with abc, so incomplete subclasses fail at instantiation instead."""
     pass
 
 
@@ -16,9 +54,11 @@ class RestApiResponseError(Exception):
     pass
 
 
-class Connection:
+class Connection(ABC):
     """Abstract parent class for a connection to some type of service providing the same info as a ConfigParser."""
 
+    __slots__ = ()
+
     def __len__(self) -> int:
         return len(self.sections())
 
@@ -37,158 +77,498 @@ class Connection:
     def values(self) -> list:
         s = []
         for key in self.keys():
-            s.append({key: self.get_section(key)})
+            s.append({key: list(self.get_section(key))})
         return s
 
+    @abstractmethod
     def sections(self) -> list[str]:
-        raise AbstractClassError("Calling not-implemented abstract class method.")
+        pass
 
+    @abstractmethod
     def has_section(self, name: str) -> bool:
-        raise AbstractClassError("Calling not-implemented abstract class method.")
+        pass
 
-    def get_section(self, section: str) -> list:
-        raise AbstractClassError("Calling not-implemented abstract class method.")
+    @abstractmethod
+    def get_section(self, section: str) -> Iterable[str]:
+        pass
 
+    @abstractmethod
     def has_option(self, section: str, option: str) -> bool:
-        raise AbstractClassError("Calling not-implemented abstract class method.")
+        pass
 
+    @abstractmethod
     def get_option(self, section: str, option: str) -> str:
-        raise AbstractClassError("Calling not-implemented abstract class method.")
+        pass
 
+    @abstractmethod
     def defaults(self) -> dict:
-        raise AbstractClassError("Calling not-implemented abstract class method.")
+        pass
+
+    def get_options(self, section: str, options: list[str]) -> dict[str, str]:
+        """Return {option: value} for several options in one section. Raises KeyError if any are missing."""
+        return {option: self.get_option(section, option) for option in options}
+
+    def items(self, section: str) -> list:
+        """Return (option, value) pairs for every option in a section. Raises KeyError if the section is missing."""
+        if not self.has_section(section):
+            raise KeyError(f"No such section {section}.")
+        return list(self.get_options(section, list(self.get_section(section))).items())
+
+    def invalidate(self):
+        """Drop any cached data. Backends that don't cache have nothing to do."""
+        pass
 
 
 class RestApiConnection(Connection):
     """Module that stores authentication and API endpoint information. Confirms connectivity."""
 
-    def __init__(self, base_url: str, username: str = None, password: str = None, headers: dict = None):
+    __slots__ = ('username', 'password', 'headers', 'base_url', 'cache_ttl', '_base', '_bulk', '_bulk_retry_at',
+                 '_root_cache', '_section_cache', '_option_cache', '_defaults_cache', '_etags', '_etag_lock',
+                 '_section_urls', '_pool_size', '_auth_tuple', '_session', '__weakref__')
+
+    def __init__(self, base_url: str, username: str = None, password: str = None, headers: dict = None,
+                 cache_ttl: float = 5.0, pool_size: int = 10, bulk: bool = True, http2: bool = False,
+                 compression: bool = True):
         """
 
         :param base_url: Root URL of API to connect to.
         :param username: Use username if provided.
         :param password: Use password if provided.
         :param token: Use token if provided in lieu of username/password
+        :param cache_ttl: Seconds to reuse fetched data before asking the API again. 0 disables caching.
+        :param pool_size: Number of keep-alive connections to hold open to the API host.
+        :param bulk: Fill the caches from the API's /bulk document in one request, if the API provides it.
+        :param http2: Talk HTTP/2 through httpx so concurrent lookups share one connection. Falls back to a requests
+            session if httpx or h2 isn't installed.
+        :param compression: Accept compressed responses. Turn off on fast local links where decompressing costs more
+            than the bytes it saves.
         """
         self.username = username
         self.password = password
         self.headers = headers
         self.base_url = base_url.strip()
+        self._base = self.base_url.rstrip('/')
+        self.cache_ttl = cache_ttl
+        # Without a cache the bulk document would be refetched for every lookup, costing more than it saves.
+        self._bulk = bulk and (cache_ttl > 0)
+        self._bulk_retry_at = 0.0
+        self._root_cache = None
+        self._section_cache = {}
+        self._option_cache = {}
+        self._defaults_cache = None
+        self._etags = OrderedDict()
+        # Lookups can run on several threads at once (get_options fan-out, prefetch), all sharing the ETag store.
+        self._etag_lock = threading.Lock()
+        self._section_urls = {}
+        self._pool_size = pool_size
 
         if self.username is None:
             self.username = ""
         if self.password is None:
             self.password = ""
 
+        self._auth_tuple = None
+        if not ((self.username == "") and (self.password == "")):
+            self._auth_tuple = (self.username, self.password)
+
+        session_headers = dict(self.headers or {})
+        if not compression:
+            session_headers.setdefault('Accept-Encoding', 'identity')
+
+        self._session = None
+        if http2 and (httpx is not None):
+            try:
+                limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+                transport = httpx.HTTPTransport(http2=True, retries=3, limits=limits)
+                # http2 is repeated here because the client, not the transport, checks that h2 is installed. The other
+                # settings match a requests session: redirects are followed, there's no timeout, and the proxy comes
+                # from the environment, which httpx stops reading once it's given a transport.
+                self._session = httpx.Client(transport=transport, http2=True, auth=self._auth_tuple,
+                                             headers=session_headers, follow_redirects=True, timeout=None,
+                                             proxy=_environ_proxy(self.base_url))
+            except ImportError:
+                self._session = None
+
+        if self._session is None:
+            self._session = requests.Session()
+            # Only idempotent reads are ever sent. Once retries run out, hand back the last response so the usual
+            # status handling reports it.
+            retry = Retry(total=3, backoff_factor=0.1, status_forcelist=[502, 503, 504],
+                          allowed_methods=frozenset(['GET', 'HEAD']), raise_on_status=False)
+            # Every request goes to the one API host, so only a couple of per-host pools are ever needed.
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retry)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+            self._session.auth = self._auth_tuple
+            self._session.headers.update(session_headers)
+
+    def close(self):
+        """Release the pooled connections held by this instance."""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     @property
     def auth_provided(self):
-        if not ((self.username == "") and (self.password == "")):
-            return True
-        return False
+        return self._auth_tuple is not None
 
     def get(self, sub_path: str, headers: dict = None, **kwargs) -> requests.Response:
-        """Method to make the appropriate get request to the API url specified."""
-
-        if (self.headers is None) and (headers is None):
-            headers_dict = None
-        else:
-            headers_dict = {}
-            if self.headers is not None:
-                for i in self.headers:
-                    headers_dict[i] = self.headers[i]
-            if headers is not None:
-                for i in headers:
-                    headers_dict[i] = headers[i]
-
-        auth_tuple = None
-        if self.auth_provided:
-            auth_tuple = (self.username, self.password)
-
-        return requests.get(naive_url_path_join(self.base_url, sub_path), auth=auth_tuple, headers=headers_dict,
-                            **kwargs)
+        """Method to make the appropriate get request to the API url specified.
 
-    def working(self) -> bool:
+        Session level auth and headers are applied by the HTTP client; headers passed here are merged on top of them.
+        The response is an httpx.Response instead when the connection was created with http2.
+        """
+        return self._session.get(self._url(sub_path), headers=headers, **kwargs)
+
+    def _parallel(self, fn, args: list) -> list:
+        """Return [fn(arg) for arg in args], run on up to pool_size threads sharing the session's connection pool."""
+        if len(args) <= 1:
+            return [fn(arg) for arg in args]
+        with ThreadPoolExecutor(max_workers=min(self._pool_size, len(args))) as executor:
+            return list(executor.map(fn, args))
+
+    def get_many(self, sub_paths: list[str], headers: dict = None, **kwargs) -> list[requests.Response]:
+        """Make several get requests concurrently, returning the responses in the order of sub_paths."""
+        return self._parallel(functools.partial(self.get, headers=headers, **kwargs), sub_paths)
+
+    def _url(self, sub_path: str) -> str:
+        """Return the full URL for sub_path.
+
+        Paths already shaped like the ones this class builds ("/section/x") are appended straight onto the normalized
+        base; anything else goes through the generic join.
+        """
+        if (sub_path[:1] == '/') and (sub_path[1:2] != '/') and (sub_path[-1] != '/') and not sub_path[-1].isspace():
+            return self._base + sub_path
+        return naive_url_path_join(self.base_url, sub_path)
+
+    def _cache_fresh(self, entry) -> bool:
+        return entry is not None and (time.monotonic() - entry[0]) < self.cache_ttl
+
+    def invalidate(self):
+        """Drop all cached API data so the next lookup goes back to the API."""
+        self._root_cache = None
+        self._section_cache = {}
+        self._option_cache = {}
+        self._defaults_cache = None
+        self._section_urls = {}
+
+    def _conditional_get(self, url: str, allowed_status: list = None) -> tuple:
+        """GET url and return (status code, parsed body).
+
+        A 200 body received with an ETag is remembered, and the next request for the same url asks the API to answer
+        with 304 Not Modified if it is unchanged, in which case the remembered body is reused and reported as a 200. The
+        least recently used bodies are forgotten once more than ETAG_CACHE_SIZE are held. The body of a non-200 response
+        that isn't JSON is returned as None.
+        """
+        if allowed_status is None:
+            allowed_status = [200]
+        with self._etag_lock:
+            known = self._etags.get(url)
+        headers = None
+        if known is not None:
+            headers = {'If-None-Match': known[0]}
+        r = self._session.get(url, headers=headers)
+        if (r.status_code == 304) and (known is not None):
+            with self._etag_lock:
+                # Another thread may have evicted the entry while the request was in flight; the body is still valid.
+                if url in self._etags:
+                    self._etags.move_to_end(url)
+            return 200, known[1]
+        if not response_ok(r, allowed_status=allowed_status):
+            raise RestApiResponseError(f"Received unexpected {r.status_code} response from API:\n{r.text}.")
         try:
-            res = self.get("")
-            if res.status_code != 200:
-                return False
-            res_json = res.json()
-            if 'data' not in res_json:
-                return False
-            if 'sections' not in res_json['data']:
+            body = response_json(r)
+        except Exception as e:
+            if r.status_code == 200:
+                raise RestApiResponseError("Problem with response received from API: " + str(e))
+            body = None
+        etag = r.headers.get('ETag')
+        if (r.status_code == 200) and (etag is not None):
+            with self._etag_lock:
+                self._etags[url] = (etag, body)
+                self._etags.move_to_end(url)
+                if len(self._etags) > ETAG_CACHE_SIZE:
+                    self._etags.popitem(last=False)
+        return r.status_code, body
+
+    def _get_json(self, sub_path: str) -> dict:
+        """Return the parsed body of a 200 response for sub_path."""
+        return self._conditional_get(self._url(sub_path))[1]
+
+    def _load_bulk(self) -> bool:
+        """Fill the root, section and defaults caches from the /bulk document in one request.
+
+        The endpoint is an optimization, so this never fails: it returns False whenever the document can't be used and
+        the caller falls back to the individual documents. An API without /bulk isn't asked again; after any other
+        problem, such as an error status or a malformed body, it is retried once BULK_RETRY_INTERVAL has passed.
+        """
+        if time.monotonic() < self._bulk_retry_at:
+            return False
+        try:
+            status, body = self._conditional_get(self._url("/bulk"), allowed_status=[200, 404])
+            if status == 404:
+                self._bulk = False
                 return False
+            data = body['data']
+            default_section = data['default_section']
+            sections = data['sections']
+            section_options = {section: sections[section] for section in sections}
+            defaults = dict(data['defaults'])
+        except Exception:
+            self._bulk_retry_at = time.monotonic() + BULK_RETRY_INTERVAL
+            return False
+        now = time.monotonic()
+        self._root_cache = (now, {'default_section': default_section, 'sections': list(sections)})
+        for section, options in section_options.items():
+            self._section_cache[section] = (now, options)
+        self._section_cache[default_section] = (now, defaults)
+        self._defaults_cache = (now, defaults)
+        return True
+
+    def _get_root_json(self) -> dict:
+        """Return the 'data' member of the root document, fetching it only if the cached copy is stale."""
+        if self._cache_fresh(self._root_cache):
+            return self._root_cache[1]
+        if self._bulk and self._load_bulk():
+            return self._root_cache[1]
+        try:
+            json_data = self._get_json("")['data']
+        except (KeyError, TypeError) as e:
+            raise RestApiResponseError("Problem with response received from API: " + str(e))
+        if ('sections' not in json_data) or ('default_section' not in json_data):
+            raise RestApiResponseError("Problem with response received from API: incomplete root document.")
+        self._root_cache = (time.monotonic(), json_data)
+        return json_data
+
+    def _warm_cache(self):
+        try:
+            self._get_root_json()
+        except Exception:
+            # Nothing is waiting on this thread; the first real lookup will fetch again and report the problem.
+            pass
+
+    def prefetch(self) -> threading.Thread:
+        """Start filling the caches on a background thread, overlapping the first round trip with other start-up work.
+
+        With a /bulk capable API this loads every section and value. Returns the started daemon thread.
+        """
+        thread = threading.Thread(target=self._warm_cache, daemon=True)
+        thread.start()
+        return thread
+
+    def _section_url(self, section: str) -> str:
+        """Return the full URL of a section, joining and encoding it only the first time it is asked for.
+
+        Names come from callers and may not exist, so the memo is emptied rather than grown past ETAG_CACHE_SIZE.
+        """
+        url = self._section_urls.get(section)
+        if url is None:
+            url = f"{self._base}/section/{quote_path_segment(section)}"
+            if len(self._section_urls) >= ETAG_CACHE_SIZE:
+                self._section_urls = {}
+            self._section_urls[section] = url
+        return url
+
+    def working(self) -> bool:
+        """Check that the API answers with a usable root document.
+
+        This goes through the same cached fetch as sections(), so a check followed by real lookups costs one request.
+        """
+        try:
+            self._get_root_json()
             return True
         except Exception:
             return False
 
     def sections(self) -> list[str]:
-        res = self.get("")
-        if res.status_code != 200:
-            raise RestApiResponseError(f"Received code {res.status_code}")
-        return self.get("").json()['data']['sections']
+        return list(self._get_root_json()['sections'])
 
     def default_section(self) -> list[str]:
-        res = self.get("")
-        if res.status_code != 200:
-            raise RestApiResponseError(f"Received code {res.status_code}")
-        return self.get("").json()['data']['default_section']
+        return self._get_root_json()['default_section']
+
+    def _stream_has_section(self, name: str) -> bool:
+        """Scan the root document for name as it arrives, without building the whole section list in memory."""
+        r = self.get("", stream=True)
+        try:
+            if r.status_code != 200:
+                raise RestApiResponseError(f"Received code {r.status_code}")
+            r.raw.decode_content = True
+            try:
+                for prefix, event, value in ijson.parse(r.raw):
+                    if (prefix in ('data.sections.item', 'data.default_section')) and (value == name):
+                        return True
+            except ijson.JSONError as e:
+                raise RestApiResponseError("Problem with response received from API: " + str(e))
+            return False
+        finally:
+            # Read off whatever is left so the connection goes back to the pool instead of being dropped.
+            r.raw.drain_conn()
+            r.close()
 
     def has_section(self, name: str) -> bool:
-        json_data = self.get("").json()['data']
+        # Streaming reads the urllib3 body directly, which only a requests session provides.
+        if (ijson is not None) and (self.cache_ttl <= 0) and isinstance(self._session, requests.Session):
+            return self._stream_has_section(name)
+        json_data = self._get_root_json()
         if name in json_data['sections']:
             return True
         if name == json_data['default_section']:
             return True
         return False
 
-    def get_section(self, section: str) -> list:
-        r = self.get(f"/section/{quote_plus(section)}")
-        if not response_ok(r, allowed_status=[200]):
-            raise RestApiResponseError(f"Received unexpected {r.status_code} response from API:\n{r.text}.")
+    def get_section(self, section: str, keys_only: bool = False) -> list:
+        """Return the option names in a section. Raises KeyError if the section is missing.
+
+        Normally this fetches and caches the section's values too, since they are usually read next. Pass
+        keys_only=True to ask for just the names; that result is not cached.
+        """
+        if keys_only:
+            if self._bulk:
+                self._get_root_json()
+            cached = self._section_cache.get(section)
+            if self._cache_fresh(cached):
+                return list(cached[1])
+            status, body = self._conditional_get(f"{self._section_url(section)}/keys", allowed_status=[200, 404])
+            if status == 200:
+                try:
+                    return list(body['data']['options'])
+                except Exception as e:
+                    raise RestApiResponseError("Problem with response received from API: " + str(e))
+            if _no_such_section(body):
+                raise KeyError(f"No such section {section}.")
+            # Any other 404 is for the path itself, from an API without the keys endpoint; fall through to a full fetch.
+        return list(self._section_options(section))
+
+    def _section_options(self, section: str):
+        """Return the options of a section from the cache, or fetch and cache them.
+
+        This is an {option: value} dict, or just a list of names from an API that predates values in section documents.
+        """
+        if self._bulk:
+            self._get_root_json()
+        cached = self._section_cache.get(section)
+        if self._cache_fresh(cached):
+            return cached[1]
+        status, body = self._conditional_get(self._section_url(section), allowed_status=[200, 404])
+        if status == 404:
+            if _no_such_section(body):
+                raise KeyError(f"No such section {section}.")
+            raise RestApiResponseError(f"Received unexpected 404 response from API:\n{body}.")
         try:
-            return r.json()['data']['options']
+            options = body['data']['options']
         except Exception as e:
             raise RestApiResponseError("Problem with response received from API: " + str(e))
+        self._section_cache[section] = (time.monotonic(), options)
+        return options
+
+    def get_options(self, section: str, options: list[str]) -> dict[str, str]:
+        """Return {option: value} for several options in one section, from a single section request where possible."""
+        if not self.has_section(section):
+            raise KeyError(f"No such section {section}.")
+        values = self._section_options(section)
+        if not isinstance(values, dict):
+            values = {}
+        # Names missing from the section document may still be valid spellings, since the backend can normalize them
+        # (configparser lowercases by default). Those, or all of them if only names came back, are asked for one by
+        # one, overlapped across the pool.
+        missing = [option for option in options if option not in values]
+        fetched = dict(zip(missing, self._parallel(functools.partial(self.get_option, section), missing)))
+        return {option: values[option] if option in values else fetched[option] for option in options}
+
+    def items(self, section: str) -> list:
+        if not self.has_section(section):
+            raise KeyError(f"No such section {section}.")
+        values = self._section_options(section)
+        if not isinstance(values, dict):
+            return super().items(section)
+        return list(values.items())
 
     def has_option(self, section: str, option: str) -> bool:
-        try:
-            self.get_option(section, option)
+        """Check for an option using the cached section when it lists the name, otherwise with a body-less HEAD request.
+
+        A name the cached section lacks may still be another spelling the backend accepts, so only the API can say no.
+        """
+        if self._bulk:
+            self._get_root_json()
+        cached = self._section_cache.get(section)
+        if self._cache_fresh(cached) and (option in cached[1]):
             return True
-        except KeyError:
+        if self._cache_fresh(self._root_cache) and not self.has_section(section):
             return False
+        # request() rather than head(), because requests' head() alone doesn't follow redirects.
+        r = self._session.request('HEAD', f"{self._section_url(section)}/option/{quote_path_segment(option)}")
+        if not response_ok(r, allowed_status=[200, 404]):
+            raise RestApiResponseError(f"Received unexpected {r.status_code} response from API.")
+        return r.status_code == 200
 
-    def get_option(self, section: str, option: str) -> str:
+    def get_option(self, section: str, option: str, refresh: bool = False) -> str:
+        """Return a single option value.
 
-        r = self.get(f"/section/{quote_plus(section)}/option/{quote_plus(option)}")
+        Served from a cached copy of the section when one is available, since the section endpoint returns values as
+        well as option names. A name the cached section lacks still goes to the API, because the backend may accept
+        other spellings of it (configparser option names are case-insensitive). Pass refresh=True to always ask the API.
+        """
+        if not refresh:
+            if self._bulk:
+                self._get_root_json()
+            cached = self._section_cache.get(section)
+            if self._cache_fresh(cached) and isinstance(cached[1], dict) and (option in cached[1]):
+                return cached[1][option]
+            cached = self._option_cache.get((section, option))
+            if self._cache_fresh(cached):
+                return cached[1]
+            if self._cache_fresh(self._root_cache) and not self.has_section(section):
+                raise KeyError(f"No such option {option} in section {section}.")
 
-        if not response_ok(r, allowed_status=[200, 404]):
-            raise RestApiResponseError(f"Received unexpected {r.status_code} response from API:\n{r.text}.")
+        status, body = self._conditional_get(f"{self._section_url(section)}/option/{quote_path_segment(option)}",
+                                             allowed_status=[200, 404])
 
-        if r.status_code == 404:
+        if status == 404:
             # This is either fine, or a Response error.
-            try:
-                message = r.json()['message']
-            except Exception as e:
-                raise RestApiResponseError("Problem with response received from API: " + str(e))
+            if not isinstance(body, dict):
+                raise RestApiResponseError("Problem with response received from API: 404 without a JSON body.")
+            message = body.get('message')
+            if message == 'no such section':
+                root = self._root_cache
+                if (root is not None) and (section in root[1]['sections']):
+                    # The section list we hold contradicts the API, so don't keep answering from it.
+                    self._root_cache = None
+                self._section_cache.pop(section, None)
             if message in ['no such section', 'no such option']:
                 raise KeyError(f"No such option {option} in section {section}.")
             else:
-                raise RestApiResponseError("Problem with response received from API: " + r.json()['message'])
-        return r.json()['data']['option']
-
-    def defaults(self) -> dict:
-        r = self.get("/defaults")
-        if not response_ok(r, allowed_status=[200]):
-            raise RestApiResponseError(f"Received unexpected {r.status_code} response from API:\n{r.text}.")
+                raise RestApiResponseError(f"Problem with response received from API: {message}")
+        value = body['data']['option']
+        self._option_cache[(section, option)] = (time.monotonic(), value)
+        return value
+
+    def _get_defaults_json(self) -> dict:
+        """Return the defaults document, fetching it only if the cached copy is stale."""
+        if self._cache_fresh(self._defaults_cache):
+            return self._defaults_cache[1]
+        body = self._get_json("/defaults")
         try:
-            return dict(r.json()['data'])
+            defaults = dict(body['data'])
         except Exception as e:
             raise RestApiResponseError("Problem with response received from API: " + str(e))
+        self._defaults_cache = (time.monotonic(), defaults)
+        return defaults
+
+    def defaults(self) -> dict:
+        if self._bulk:
+            self._get_root_json()
+        return dict(self._get_defaults_json())
 
 
 class ConfigParserConnection(Connection):
     """Adapts a specified RawConfigParser to a Connection."""
 
+    __slots__ = ('config', '__weakref__')
+
     def __init__(self, _config: RawConfigParser):
         self.config = _config
 
@@ -196,21 +576,32 @@ class ConfigParserConnection(Connection):
         return self.config.default_section
 
     def sections(self) -> list[str]:
-        return list(self.config.sections())
+        # RawConfigParser.sections() already builds a new list.
+        return self.config.sections()
 
     def has_section(self, name: str) -> bool:
         if name == self.default_section():
             return True
         return self.config.has_section(name)
 
-    def get_section(self, section: str) -> list:
-        return list(self.config[section].keys())
+    def get_section(self, section: str) -> Iterable[str]:
+        return self.config[section].keys()
 
     def has_option(self, section: str, option: str) -> bool:
         return self.config.has_option(section, option)
 
     def get_option(self, section: str, option: str) -> str:
-        return self.config.get(section, option)
+        try:
+            return self.config.get(section, option)
+        except (NoSectionError, NoOptionError):
+            raise KeyError(f"No such option {option} in section {section}.")
 
-    def defaults(self) -> dict:
-        return dict(self.config.defaults())
+    def defaults(self) -> types.MappingProxyType:
+        """Return a read-only view of the parser's defaults, which avoids copying them."""
+        return types.MappingProxyType(self.config.defaults())
+
+    def items(self, section: str) -> list:
+        try:
+            return self.config.items(section)
+        except NoSectionError:
+            raise KeyError(f"No such section {section}.")
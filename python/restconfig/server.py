@@ -0,0 +1,46 @@
+"""Server module provides helpers for hosting the restconfig blueprint outside of the flask development server."""
+
+from flask import Flask
+from .blueprint import construct_restconfig_blueprint
+from .connection import Connection
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError:
+    WSGIMiddleware = None
+
+try:
+    import waitress
+except ImportError:
+    waitress = None
+
+
+def construct_restconfig_app(_config: Connection, url_prefix: str = "/config") -> Flask:
+    """Build a flask app with the restconfig blueprint registered under url_prefix."""
+    app = Flask(__name__)
+    app.register_blueprint(construct_restconfig_blueprint(_config), url_prefix=url_prefix)
+    return app
+
+
+def construct_restconfig_asgi_app(_config: Connection, url_prefix: str = "/config", threads: int = 16):
+    """Build the restconfig app wrapped as an ASGI application, for serving with uvicorn or hypercorn.
+
+    The views stay synchronous because every Connection is; a2wsgi runs them on a pool of `threads` worker threads so
+    the event loop keeps accepting requests and up to that many backend lookups can block at once. Requires the a2wsgi
+    package.
+    """
+    if WSGIMiddleware is None:
+        raise ImportError("a2wsgi is required to build an ASGI application.")
+    return WSGIMiddleware(construct_restconfig_app(_config, url_prefix), workers=threads)
+
+
+def serve(app: Flask, host: str = "127.0.0.1", port: int = 5000, threads: int = 16):
+    """Serve app with a pool of request threads so one slow backend lookup doesn't stall unrelated requests.
+
+    Uses waitress when it is installed, otherwise falls back to the threaded werkzeug development server. For
+    multi-process production deployments use a WSGI server such as gunicorn directly (see README).
+    """
+    if waitress is not None:
+        waitress.serve(app, host=host, port=port, threads=threads)
+    else:
+        app.run(host=host, port=port, threaded=True)
@@ -1,32 +1,40 @@
 """Utility module with helper functions that don't fit firmly in another module."""
 
+import functools
+import json
 from requests import Response
+from urllib.parse import quote_plus
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 
 def naive_url_path_join(first: str, second: str, *args) -> str:
-    path = first.strip()
-    second = second.strip()
-    if second in ["/", ""]:
-        return path
-    if path[-1] != '/':
-        path = path + '/'
-    if second[0] == "/":
-        path = path + second[1:]
-    else:
-        path = path + "/" + second
-
-    for arg in args:
-        arg = arg.strip()
-        if arg in ["/", ""]:
-            continue
-        if arg[0] == "/":
-            arg = arg[1:]
-        if path[-1] == "/":
-            path = path + arg
-        else:
-            path = path + "/" + arg
-
-    return path
+    if not args:
+        # Common case of a clean base and a single "/a/b" style path, which only needs concatenating.
+        if second in ["", "/"]:
+            return first.strip()
+        if (second[0] == "/") and (second[1:2] != "/") and (second[-1] != "/") and not second[-1].isspace() and \
+                first and (first[-1] != "/") and not first[0].isspace() and not first[-1].isspace():
+            return first + second
+    parts = [first.strip().rstrip('/')]
+    for arg in (second, *args):
+        arg = arg.strip().strip('/')
+        if arg:
+            parts.append(arg)
+    if len(parts) == 1:
+        # Nothing to add, so hand back the base as given.
+        return first.strip()
+    return '/'.join(parts)
+
+
+@functools.lru_cache(maxsize=1024)
+def quote_path_segment(segment: str) -> str:
+    """quote_plus a section or option name for use in a URL path. Names repeat heavily, so results are memoized."""
+    return quote_plus(segment)
 
 
 def response_ok(r: Response, allowed_status: list = None):
@@ -35,3 +43,11 @@ def response_ok(r: Response, allowed_status: list = None):
     if r.status_code not in allowed_status:
         return False
     return True
+
+
+def response_json(r: Response):
+    """Parse the body of r. Uses orjson on the raw bytes when it is installed, which skips decoding r.text.
+
+    Works with any response object exposing the body bytes as .content, including httpx responses.
+    """
+    return _json_loads(r.content)
@@ -9,3 +9,7 @@ config['TEST']['val1'] = "42"
 cpc = ConfigParserConnection(config)
 app = Flask(__name__)
 app.register_blueprint(construct_restconfig_blueprint(cpc), url_prefix='/config')
+
+
+if __name__ == '__main__':
+    app.run(threaded=True)
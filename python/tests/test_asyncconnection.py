@@ -0,0 +1,43 @@
+"""Tests for AsyncRestApiConnection against the live blueprint server used by test_connection."""
+
+import unittest
+from test_connection import LiveServer
+from restconfig.asyncconnection import AsyncRestApiConnection
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class AsyncRestApiConnectionTests(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.server = LiveServer()
+        self.addCleanup(self.server.stop)
+        # Built outside the event loop: creating the client's SSL context is slow enough to trip asyncio debug warnings.
+        self.conn = AsyncRestApiConnection(self.server.url, http2=False)
+
+    async def asyncTearDown(self):
+        await self.conn.aclose()
+
+    async def test_lookups(self):
+        self.assertEqual(await self.conn.sections(), ['TEST', 'BAD'])
+        self.assertTrue(await self.conn.has_section('TEST'))
+        self.assertEqual(await self.conn.get_option('TEST', 'VAL1'), '42')
+        self.assertEqual(await self.conn.bulk_get_options('TEST', ['val1', 'd1']), {'val1': '42', 'd1': '1.5'})
+        self.assertEqual(await self.conn.defaults(), {'shared': 'yes'})
+
+    async def test_missing_data_raises_key_error(self):
+        with self.assertRaises(KeyError):
+            await self.conn.get_section('nope')
+        with self.assertRaises(KeyError):
+            await self.conn.get_option('nope', 'x')
+        with self.assertRaises(KeyError):
+            await self.conn.get_option('TEST', 'nope')
+        self.assertFalse(await self.conn.has_option('TEST', 'nope'))
+
+
+if __name__ == '__main__':
+    unittest.main()
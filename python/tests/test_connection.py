@@ -0,0 +1,426 @@
+"""Tests for RestApiConnection against the restconfig blueprint served over a real socket."""
+
+import os
+import threading
+import time
+import unittest
+import weakref
+from configparser import ConfigParser, NoOptionError, NoSectionError, RawConfigParser
+from unittest import mock
+from werkzeug.serving import make_server, WSGIRequestHandler
+from restconfig import connection
+from restconfig.configclient import ReadOnlyConfig
+from restconfig.connection import ConfigParserConnection, RestApiConnection
+from restconfig.server import construct_restconfig_app
+
+try:
+    import h2
+    import httpx
+except ImportError:
+    h2 = httpx = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+CONFIG = """
+[DEFAULT]
+shared = yes
+
+[TEST]
+val1 = 42
+d1 = 1.5
+
+[BAD]
+broken = %(nope)s
+fine = ok
+"""
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class LiveServer:
+    """Serve the blueprint for a ConfigParser on a free local port, recording every request it answers.
+
+    Set bulk to a (status, content type, body) tuple to answer /bulk with that instead of the real document. Anything
+    under /moved is permanently redirected to the same path under /config. Set delay to make every request take that
+    many seconds.
+    """
+
+    def __init__(self, text: str = CONFIG):
+        self.parser = ConfigParser()
+        self.parser.read_string(text)
+        self.app = construct_restconfig_app(ConfigParserConnection(self.parser))
+        # Some tests serve values that fail on purpose; the 500 they get is checked, so skip flask's traceback log.
+        self.app.logger.disabled = True
+        self.requests = []
+        self.bulk = None
+        self.delay = 0
+        self._app = self.app.wsgi_app
+        self.app.wsgi_app = self._record
+        self._server = make_server('127.0.0.1', 0, self.app, threaded=True, request_handler=_QuietHandler)
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        self.url = f"http://127.0.0.1:{self._server.port}/config"
+
+    def _record(self, environ, start_response):
+        if self.delay:
+            time.sleep(self.delay)
+        def record_status(status, headers, *args):
+            self.requests.append((environ['REQUEST_METHOD'], environ['PATH_INFO'], int(status.split()[0])))
+            return start_response(status, headers, *args)
+
+        if environ['PATH_INFO'].startswith('/moved'):
+            record_status('308 PERMANENT REDIRECT', [('Location', '/config' + environ['PATH_INFO'][len('/moved'):])])
+            return [b'']
+        if (self.bulk is not None) and environ['PATH_INFO'].endswith('/bulk'):
+            status, content_type, body = self.bulk
+            record_status(status, [('Content-Type', content_type)])
+            return [body]
+        return self._app(environ, record_status)
+
+    def paths(self) -> list:
+        return [path for method, path, status in self.requests]
+
+    def stop(self):
+        self._server.shutdown()
+        self._thread.join()
+
+
+class LiveServerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LiveServer()
+        self.addCleanup(self.server.stop)
+
+    def connect(self, **kwargs) -> RestApiConnection:
+        conn = RestApiConnection(self.server.url, **kwargs)
+        self.addCleanup(conn.close)
+        return conn
+
+
+class CacheTests(LiveServerTestCase):
+
+    def test_bulk_fills_every_cache_in_one_request(self):
+        conn = self.connect()
+        self.assertTrue(conn.working())
+        self.assertEqual(sorted(conn.sections()), ['BAD', 'TEST'])
+        self.assertEqual(conn.get_option('TEST', 'val1'), '42')
+        self.assertEqual(conn.get_options('TEST', ['val1', 'd1']), {'val1': '42', 'd1': '1.5'})
+        self.assertEqual(conn.defaults(), {'shared': 'yes'})
+        self.assertEqual(self.server.paths(), ['/config/bulk'])
+
+    def test_cached_option_is_reused_until_it_expires(self):
+        conn = self.connect(cache_ttl=0.2, bulk=False)
+        for _ in range(3):
+            self.assertEqual(conn.get_option('TEST', 'val1'), '42')
+        self.assertEqual(len(self.server.requests), 1)
+        time.sleep(0.3)
+        self.assertEqual(conn.get_option('TEST', 'val1'), '42')
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_invalidate_drops_cached_data(self):
+        conn = self.connect()
+        conn.get_option('TEST', 'val1')
+        self.server.parser['TEST']['val1'] = '43'
+        self.assertEqual(conn.get_option('TEST', 'val1'), '42')
+        conn.invalidate()
+        self.assertEqual(conn.get_option('TEST', 'val1'), '43')
+
+    def test_no_cache_asks_every_time(self):
+        conn = self.connect(cache_ttl=0)
+        for _ in range(3):
+            conn.get_option('TEST', 'val1')
+        self.assertEqual(self.server.paths(), ['/config/section/TEST/option/val1'] * 3)
+
+    def test_missing_section_is_answered_from_root_cache(self):
+        cfg = ReadOnlyConfig(self.connect())
+        self.assertEqual([cfg.get('nope', 'x', fallback=1) for _ in range(5)], [1] * 5)
+        self.assertEqual(self.server.paths(), ['/config/bulk'])
+
+
+class OptionNameTests(LiveServerTestCase):
+    """configparser lowercases option names, so the API accepts any case even though documents list lowercase names."""
+
+    def test_mixed_case_option_is_found_past_cached_section(self):
+        for kwargs in [{}, {'bulk': False}]:
+            with self.subTest(**kwargs):
+                conn = self.connect(**kwargs)
+                conn.get_section('TEST')
+                self.assertEqual(conn.get_option('TEST', 'VAL1'), '42')
+                self.assertEqual(conn.get_options('TEST', ['Val1', 'd1']), {'Val1': '42', 'd1': '1.5'})
+                with self.assertRaises(KeyError):
+                    conn.get_option('TEST', 'nope')
+
+    def test_mixed_case_typed_lookup(self):
+        cfg = ReadOnlyConfig(self.connect())
+        self.assertEqual(cfg.getint('TEST', 'VAL1'), 42)
+        self.assertEqual(cfg.get('TEST', 'D1'), '1.5')
+
+    def test_mixed_case_has_option(self):
+        conn = self.connect()
+        self.assertTrue(conn.has_option('TEST', 'val1'))
+        self.assertEqual(self.server.paths(), ['/config/bulk'])
+        self.assertTrue(conn.has_option('TEST', 'Val1'))
+        self.assertFalse(conn.has_option('TEST', 'nope'))
+        self.assertEqual(ReadOnlyConfig(conn)['TEST']['VAL1'], '42')
+
+
+class ConditionalRequestTests(LiveServerTestCase):
+
+    def test_unchanged_document_is_revalidated_with_304(self):
+        conn = self.connect(cache_ttl=0)
+        self.assertEqual(conn.defaults(), {'shared': 'yes'})
+        self.assertEqual(conn.defaults(), {'shared': 'yes'})
+        self.assertEqual([status for method, path, status in self.server.requests], [200, 304])
+
+    def test_changed_document_is_fetched_again(self):
+        conn = self.connect(cache_ttl=0)
+        conn.get_option('TEST', 'val1')
+        self.server.parser['TEST']['val1'] = '43'
+        self.assertEqual(conn.get_option('TEST', 'val1'), '43')
+        self.assertEqual([status for method, path, status in self.server.requests], [200, 200])
+
+    def test_304_after_concurrent_eviction_still_returns_value(self):
+        conn = self.connect(cache_ttl=0)
+        conn.get_option('TEST', 'val1')
+        session_get = conn._session.get
+
+        def evicting_get(*args, **kwargs):
+            # Stands in for another thread pushing this url out of the store while the request is in flight.
+            response = session_get(*args, **kwargs)
+            conn._etags.clear()
+            return response
+
+        with mock.patch.object(conn._session, 'get', side_effect=evicting_get):
+            self.assertEqual(conn.get_option('TEST', 'val1'), '42')
+        self.assertEqual(self.server.requests[-1][2], 304)
+
+    def test_section_url_memo_is_bounded(self):
+        conn = self.connect(bulk=False)
+        with mock.patch.object(connection, 'ETAG_CACHE_SIZE', 2):
+            for section in ['a', 'b', 'c']:
+                conn.has_option(section, 'x')
+        self.assertEqual(list(conn._section_urls), ['c'])
+        conn.invalidate()
+        self.assertEqual(conn._section_urls, {})
+
+    def test_etag_store_is_bounded(self):
+        conn = self.connect(cache_ttl=0)
+        with mock.patch.object(connection, 'ETAG_CACHE_SIZE', 1):
+            conn.get_option('TEST', 'val1')
+            conn.get_option('TEST', 'd1')
+        self.assertEqual(list(conn._etags), [f"{self.server.url}/section/TEST/option/d1"])
+
+
+class BulkFallbackTests(LiveServerTestCase):
+
+    def assert_per_document_lookups_work(self, conn: RestApiConnection):
+        self.assertTrue(conn.working())
+        self.assertEqual(sorted(conn.sections()), ['BAD', 'TEST'])
+        self.assertTrue(conn.has_section('TEST'))
+        self.assertEqual(conn.get_option('TEST', 'val1'), '42')
+        self.assertEqual(conn.defaults(), {'shared': 'yes'})
+
+    def test_missing_bulk_endpoint_is_not_asked_again(self):
+        self.server.bulk = ('404 NOT FOUND', 'text/html', b'<h1>Not Found</h1>')
+        conn = self.connect()
+        self.assert_per_document_lookups_work(conn)
+        conn.invalidate()
+        conn.sections()
+        self.assertEqual(self.server.paths().count('/config/bulk'), 1)
+
+    def test_failing_bulk_endpoint_falls_back(self):
+        for status in ['500 INTERNAL SERVER ERROR', '403 FORBIDDEN', '405 METHOD NOT ALLOWED']:
+            with self.subTest(status=status):
+                self.server.bulk = (status, 'text/html', b'no')
+                self.assert_per_document_lookups_work(self.connect())
+
+    def test_malformed_bulk_body_falls_back(self):
+        self.server.bulk = ('200 OK', 'application/json', b'{"message": "ok", "data": []}')
+        self.assert_per_document_lookups_work(self.connect())
+
+    def test_failing_bulk_endpoint_is_retried_after_backoff(self):
+        self.server.bulk = ('500 INTERNAL SERVER ERROR', 'text/html', b'no')
+        conn = self.connect()
+        with mock.patch.object(connection, 'BULK_RETRY_INTERVAL', 0.2):
+            conn.sections()
+            conn.invalidate()
+            conn.sections()
+            self.assertEqual(self.server.paths().count('/config/bulk'), 1)
+            self.server.bulk = None
+            time.sleep(0.3)
+            conn.invalidate()
+            conn.sections()
+        self.assertEqual(self.server.paths().count('/config/bulk'), 2)
+
+    def test_unreadable_value_only_fails_its_own_option(self):
+        conn = self.connect()
+        self.assertEqual(sorted(conn.sections()), ['BAD', 'TEST'])
+        self.assertEqual(conn.get_option('BAD', 'fine'), 'ok')
+        self.assertEqual(sorted(conn.get_section('BAD')), ['broken', 'fine', 'shared'])
+        with self.assertRaises(connection.RestApiResponseError):
+            conn.get_option('BAD', 'broken')
+
+
+class MissingDataTests(LiveServerTestCase):
+
+    def test_missing_section_raises_key_error(self):
+        conn = self.connect(bulk=False)
+        for lookup in [lambda: conn.items('nope'), lambda: conn.get_options('nope', ['x']),
+                       lambda: conn.get_section('nope'), lambda: conn.get_section('nope', keys_only=True)]:
+            with self.assertRaises(KeyError):
+                lookup()
+
+    def test_keys_only_for_missing_section_costs_one_request(self):
+        conn = self.connect(bulk=False)
+        with self.assertRaises(KeyError):
+            conn.get_section('nope', keys_only=True)
+        self.assertEqual(self.server.paths(), ['/config/section/nope/keys'])
+
+    def test_config_parser_backend_raises_key_error(self):
+        conn = ConfigParserConnection(self.server.parser)
+        with self.assertRaises(KeyError):
+            conn.items('nope')
+        with self.assertRaises(KeyError):
+            conn.get_option('TEST', 'nope')
+
+    def test_typed_getters_raise_configparser_errors(self):
+        cfg = ReadOnlyConfig(self.connect())
+        with self.assertRaises(NoOptionError):
+            cfg.getint('TEST', 'nope')
+        with self.assertRaises(NoSectionError):
+            cfg.getfloat('nope', 'x')
+        self.assertEqual(cfg.getint('TEST', 'nope', fallback=7), 7)
+
+    def test_config_parser_defaults_are_read_only(self):
+        cfg = ReadOnlyConfig(ConfigParserConnection(self.server.parser))
+        self.assertEqual(dict(cfg.defaults()), {'shared': 'yes'})
+        with self.assertRaises(TypeError):
+            cfg.defaults()['shared'] = 'changed'
+        self.assertEqual(self.server.parser['TEST']['shared'], 'yes')
+
+    def test_read_only_config_passes_for_a_parser(self):
+        self.assertIsInstance(ReadOnlyConfig(self.connect()), RawConfigParser)
+
+    def test_connections_are_weak_referenceable(self):
+        weakref.ref(self.connect())
+        weakref.ref(ConfigParserConnection(self.server.parser))
+
+
+class TransportTests(LiveServerTestCase):
+    """The requests and httpx backed sessions should behave the same."""
+
+    def transports(self) -> list:
+        return [False, True] if httpx is not None else [False]
+
+    def test_lookups(self):
+        for http2 in self.transports():
+            with self.subTest(http2=http2):
+                conn = self.connect(http2=http2)
+                self.assertEqual(conn.get_options('TEST', ['val1', 'D1']), {'val1': '42', 'D1': '1.5'})
+                self.assertTrue(conn.has_option('TEST', 'Val1'))
+                self.assertFalse(conn.has_option('TEST', 'nope'))
+
+    @unittest.skipIf(httpx is None, "httpx and h2 are not installed")
+    def test_http2_uses_httpx(self):
+        self.assertIsInstance(self.connect(http2=True)._session, httpx.Client)
+
+    def test_redirects_are_followed(self):
+        for http2 in self.transports():
+            with self.subTest(http2=http2):
+                conn = RestApiConnection(self.server.url.replace('/config', '/moved'), http2=http2, cache_ttl=0)
+                self.addCleanup(conn.close)
+                self.assertEqual(conn.sections(), ['TEST', 'BAD'])
+                self.assertEqual(conn.get_option('TEST', 'val1'), '42')
+                self.assertTrue(conn.has_option('TEST', 'val1'))
+
+    def test_proxy_comes_from_environment(self):
+        # The live server doubles as the proxy: it is handed absolute URLs for a host that doesn't resolve.
+        environ = {'HTTP_PROXY': self.server.url.replace('/config', ''), 'NO_PROXY': '', 'no_proxy': ''}
+        for http2 in self.transports():
+            with self.subTest(http2=http2), mock.patch.dict(os.environ, environ):
+                conn = RestApiConnection('http://config.invalid/config', http2=http2)
+                self.addCleanup(conn.close)
+                self.assertEqual(conn.get_option('TEST', 'val1'), '42')
+
+
+class FanOutTests(LiveServerTestCase):
+
+    def test_get_many_keeps_order_and_overlaps_requests(self):
+        conn = self.connect(pool_size=5)
+        paths = ['', '/section/TEST', '/section/nope', '/defaults', '/section/TEST/option/val1']
+        self.server.delay = 0.2
+        start = time.monotonic()
+        responses = conn.get_many(paths)
+        elapsed = time.monotonic() - start
+        self.assertEqual([r.status_code for r in responses], [200, 200, 404, 200, 200])
+        self.assertEqual(responses[4].json()['data']['option'], '42')
+        self.assertLess(elapsed, 3 * self.server.delay)
+
+    def test_get_options_fans_out_for_name_only_sections(self):
+        # One unreadable value makes the server list just the names for BAD, so each option is fetched on its own.
+        conn = self.connect(bulk=False)
+        self.assertEqual(conn.get_options('BAD', ['fine', 'shared']), {'fine': 'ok', 'shared': 'yes'})
+        self.assertEqual(sorted(self.server.paths()[-2:]),
+                         ['/config/section/BAD/option/fine', '/config/section/BAD/option/shared'])
+
+
+class PrefetchTests(LiveServerTestCase):
+
+    def test_prefetch_fills_caches_in_background(self):
+        conn = self.connect()
+        thread = conn.prefetch()
+        self.assertTrue(thread.daemon)
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(self.server.paths(), ['/config/bulk'])
+        self.assertEqual(conn.get_option('TEST', 'val1'), '42')
+        self.assertEqual(conn.defaults(), {'shared': 'yes'})
+        self.assertEqual(self.server.paths(), ['/config/bulk'])
+
+    def test_prefetch_failure_is_reported_by_first_lookup(self):
+        conn = RestApiConnection('http://127.0.0.1:1/config')
+        self.addCleanup(conn.close)
+        thread = conn.prefetch()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(conn.working())
+
+
+@unittest.skipIf(ijson is None, "ijson is not installed")
+class StreamingTests(LiveServerTestCase):
+    """With caching off, has_section scans the root document as it arrives instead of parsing all of it."""
+
+    def test_has_section_streams_root_document(self):
+        conn = self.connect(cache_ttl=0)
+        with mock.patch.object(connection.ijson, 'parse', wraps=connection.ijson.parse) as parse:
+            self.assertTrue(conn.has_section('BAD'))
+            self.assertTrue(conn.has_section('DEFAULT'))
+            self.assertFalse(conn.has_section('nope'))
+        self.assertEqual(parse.call_count, 3)
+        self.assertEqual(self.server.paths(), ['/config'] * 3)
+
+    def test_has_section_streams_compressed_root_document(self):
+        server = LiveServer(''.join(f"[section{i}]\nkey = value\n" for i in range(200)))
+        self.addCleanup(server.stop)
+        conn = RestApiConnection(server.url, cache_ttl=0)
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.get("").headers['Content-Encoding'], 'gzip')
+        self.assertTrue(conn.has_section('section199'))
+        self.assertFalse(conn.has_section('section200'))
+
+
+class BlueprintTests(LiveServerTestCase):
+
+    def test_responses_are_private(self):
+        response = self.server.app.test_client().get('/config/section/TEST')
+        self.assertEqual(response.headers['Cache-Control'], 'private, max-age=5, must-revalidate')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for the hosting helpers in restconfig.server."""
+
+import asyncio
+import json
+import time
+import unittest
+from configparser import ConfigParser
+from restconfig.connection import ConfigParserConnection
+from restconfig.server import construct_restconfig_asgi_app
+
+try:
+    import a2wsgi
+except ImportError:
+    a2wsgi = None
+
+
+class SlowConnection(ConfigParserConnection):
+    """ConfigParserConnection whose section list takes DELAY seconds, like a backend waiting on the network."""
+
+    DELAY = 0.2
+
+    def sections(self) -> list[str]:
+        time.sleep(self.DELAY)
+        return super().sections()
+
+
+async def asgi_get(app, path: str) -> tuple:
+    """Send one GET through an ASGI app, returning (status, body)."""
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+             'path': path, 'raw_path': path.encode(), 'root_path': '', 'query_string': b'', 'headers': [],
+             'server': ('testserver', 80), 'client': ('127.0.0.1', 1234)}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    status = next(m['status'] for m in messages if m['type'] == 'http.response.start')
+    body = b''.join(m.get('body', b'') for m in messages if m['type'] == 'http.response.body')
+    return status, body
+
+
+@unittest.skipIf(a2wsgi is None, "a2wsgi is not installed")
+class AsgiAppTests(unittest.TestCase):
+
+    def setUp(self):
+        parser = ConfigParser()
+        parser.read_string("[TEST]\nval1 = 42\n")
+        self.backend = SlowConnection(parser)
+
+    def test_serves_the_blueprint(self):
+        app = construct_restconfig_asgi_app(self.backend)
+        status, body = asyncio.run(asgi_get(app, '/config'))
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)['data']['sections'], ['TEST'])
+
+    def test_blocking_lookups_overlap(self):
+        app = construct_restconfig_asgi_app(self.backend, threads=5)
+
+        async def five_at_once():
+            return await asyncio.gather(*(asgi_get(app, '/config') for _ in range(5)))
+
+        start = time.monotonic()
+        results = asyncio.run(five_at_once())
+        elapsed = time.monotonic() - start
+        self.assertEqual([status for status, body in results], [200] * 5)
+        # Serialized, five lookups would take 5 * DELAY.
+        self.assertLess(elapsed, 3 * SlowConnection.DELAY)
+
+
+if __name__ == '__main__':
+    unittest.main()
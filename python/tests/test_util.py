@@ -0,0 +1,41 @@
+"""Tests for restconfig.util."""
+
+import itertools
+import unittest
+from restconfig.util import naive_url_path_join
+
+
+class NaiveUrlPathJoinTests(unittest.TestCase):
+
+    def test_joins_with_exactly_one_slash(self):
+        cases = [
+            (('http://h/config', '/section/a'), 'http://h/config/section/a'),
+            (('http://h/config/', '/section/a'), 'http://h/config/section/a'),
+            (('http://h/config', 'section/a'), 'http://h/config/section/a'),
+            (('http://h/config', '//a'), 'http://h/config/a'),
+            ((' http://h/config ', ' /x/ '), 'http://h/config/x'),
+        ]
+        for args, expected in cases:
+            with self.subTest(args=args):
+                self.assertEqual(naive_url_path_join(*args), expected)
+
+    def test_empty_pieces_leave_base_unchanged(self):
+        self.assertEqual(naive_url_path_join('http://h/config', ''), 'http://h/config')
+        self.assertEqual(naive_url_path_join('http://h/config/', '/'), 'http://h/config/')
+        self.assertEqual(naive_url_path_join(' http://h/c ', '', '/', ' '), 'http://h/c')
+
+    def test_joins_several_pieces(self):
+        self.assertEqual(naive_url_path_join('http://h/c', '/a/', 'b', '/c/'), 'http://h/c/a/b/c')
+        self.assertEqual(naive_url_path_join('http://h/c/', 'a', '', 'b'), 'http://h/c/a/b')
+
+    def test_two_argument_fast_path_matches_general_join(self):
+        # A trailing empty piece adds nothing but sends the call down the general path.
+        bases = ['http://h/c', 'http://h/c/', ' http://h/c', 'http://h/c ', 'http://h/c//']
+        paths = ['', '/', ' ', '/a', 'a', '/a/', '//a', '/a ', ' /a', '/a/b', '/a b']
+        for base, path in itertools.product(bases, paths):
+            with self.subTest(base=base, path=path):
+                self.assertEqual(naive_url_path_join(base, path), naive_url_path_join(base, path, ''))
+
+
+if __name__ == '__main__':
+    unittest.main()